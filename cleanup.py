@@ -3,10 +3,32 @@ Cleanup script to organize project structure and remove unnecessary files.
 """
 
 import os
+import errno
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import config
 
+# Renames release the GIL, so a few threads let the filesystem overlap them
+MOVE_WORKERS = 8
+
+def _safe_replace(src, dst):
+    """Move src to dst, ignoring files that don't exist."""
+    # A rename unless dst is on another device (LOG_DIR may be under OneDrive)
+    try:
+        os.replace(src, dst)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+def _replace_all(moves):
+    """Run _safe_replace over (src, dst) pairs in a thread pool."""
+    with ThreadPoolExecutor(max_workers=MOVE_WORKERS) as executor:
+        list(executor.map(lambda move: _safe_replace(*move), moves))
+
 def create_directory_structure():
     """Create organized directory structure."""
     directories = {
@@ -20,9 +42,8 @@ def create_directory_structure():
         }
     }
     
-    # Create main directories
-    for dir_path in [directories['logs'], directories['data']]:
-        os.makedirs(dir_path, exist_ok=True)
+    # Create main directories (logs/data are owned by config)
+    config.ensure_dirs()
         
     # Create src subdirectories
     for subdir in directories['src'].values():
@@ -60,22 +81,16 @@ def move_files_to_directories(directories):
         'style.css'
     ]
     
-    # Move files
-    for file in strategy_files:
-        if os.path.exists(file):
-            shutil.move(file, os.path.join(directories['src']['strategies'], file))
-            
-    for file in util_files:
-        if os.path.exists(file):
-            shutil.move(file, os.path.join(directories['src']['utils'], file))
-            
-    for file in api_files:
-        if os.path.exists(file):
-            shutil.move(file, os.path.join(directories['src']['api'], file))
-            
-    for file in dashboard_files:
-        if os.path.exists(file):
-            shutil.move(file, os.path.join(directories['src']['dashboard'], file))
+    # Build a single (source, destination) table for all categories
+    moves = (
+        [(file, os.path.join(directories['src']['strategies'], file)) for file in strategy_files] +
+        [(file, os.path.join(directories['src']['utils'], file)) for file in util_files] +
+        [(file, os.path.join(directories['src']['api'], file)) for file in api_files] +
+        [(file, os.path.join(directories['src']['dashboard'], file)) for file in dashboard_files]
+    )
+    
+    # Move files (same filesystem, so a plain rename is enough)
+    _replace_all(moves)
 
 def cleanup_logs():
     """Clean up old log files."""
@@ -88,12 +103,25 @@ def cleanup_logs():
         'latest_scan.txt'
     ]
     
+    # One timestamp and destination prefix for the whole run
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_dir = f"{config.LOG_DIR}{os.sep}"
+    
+    # Pick backup names first, then do the moves together
+    moves = []
     for log_file in log_files:
-        if os.path.exists(log_file):
-            # Create backup with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_name = f"{os.path.splitext(log_file)[0]}_{timestamp}{os.path.splitext(log_file)[1]}"
-            shutil.move(log_file, os.path.join(config.LOG_DIR, backup_name))
+        # Create backup with timestamp, adding a sequence number if a
+        # backup from the same second already exists. Missing log files
+        # are skipped by _safe_replace.
+        stem, ext = os.path.splitext(log_file)
+        backup_path = f"{log_dir}{stem}_{timestamp}{ext}"
+        seq = 0
+        while os.path.exists(backup_path):
+            seq += 1
+            backup_path = f"{log_dir}{stem}_{timestamp}_{seq}{ext}"
+        moves.append((log_file, backup_path))
+    
+    _replace_all(moves)
 
 def remove_unnecessary_files():
     """Remove unnecessary files."""
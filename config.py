@@ -4,14 +4,31 @@ Optimized for focused capital allocation and improved profitability.
 """
 
 import os
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+@dataclass(frozen=True)
+class Config:
+    """Settings read from the environment / .env file."""
+    API_KEY: str
+    API_SECRET: str
+    USE_TESTNET: bool
+
+@lru_cache(maxsize=1)
+def get_config():
+    """Load .env and read the environment exactly once per process."""
+    load_dotenv()
+    return Config(
+        API_KEY=os.getenv("BINANCE_API_KEY"),
+        API_SECRET=os.getenv("BINANCE_SECRET_KEY"),
+        USE_TESTNET=os.getenv("USE_TESTNET", "False").lower() == "true"
+    )
 
 # API credentials
-API_KEY = os.getenv("BINANCE_API_KEY")
-API_SECRET = os.getenv("BINANCE_SECRET_KEY")
+API_KEY = get_config().API_KEY
+API_SECRET = get_config().API_SECRET
 
 # Trading settings
 # EXPANDED number of trading pairs for better opportunities
@@ -22,20 +39,15 @@ TRADING_PAIRS = [
     "SOLUSDT",  # Altcoin - 20% allocation
     "AVAXUSDT"  # Altcoin - 20% allocation
 ]
-USE_TESTNET = os.getenv("USE_TESTNET", "False").lower() == "true"
+USE_TESTNET = get_config().USE_TESTNET
 
 # File paths
 BASE_DIR = os.path.join(os.path.expanduser("~"), "OneDrive", "Desktop", "All Bots", "Crypto Bot")
 LOG_DIR = os.path.join(BASE_DIR, "logs")
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
-# Create directories if they don't exist
-os.makedirs(LOG_DIR, exist_ok=True)
-os.makedirs(DATA_DIR, exist_ok=True)
-
 # Log file path
 LOG_FILE = os.path.join(LOG_DIR, "bot.log")
-TRADE_LOGS_DIR = BASE_DIR  # Store trade logs in the main bot directory
 
 # Strategy selection
 STRATEGY = "TRON11"  # Options: SMA, RSI, COMBINED, SMALL, TRON11
@@ -113,6 +125,15 @@ FEE_ADJUSTED_MIN_VALUES = {
     for symbol, value in MIN_ORDER_VALUES.items()
 }
 
+# Per-pair parameters laid out by position in TRADING_PAIRS, so hot loops can
+# look them up by integer index (PAIR_INDEX[symbol]) instead of hashing symbols.
+# Pass these to np.asarray() to check all pairs at once.
+PAIR_INDEX = {symbol: i for i, symbol in enumerate(TRADING_PAIRS)}
+STOP_LOSS_BY_PAIR = tuple(STOP_LOSS_PERCENTAGE.get(s, STOP_LOSS_PERCENTAGE['DEFAULT']) for s in TRADING_PAIRS)
+TAKE_PROFIT_BY_PAIR = tuple(TAKE_PROFIT_PERCENTAGE.get(s, TAKE_PROFIT_PERCENTAGE['DEFAULT']) for s in TRADING_PAIRS)
+MIN_ORDER_BY_PAIR = tuple(MIN_ORDER_VALUES.get(s, MIN_ORDER_VALUES['DEFAULT']) for s in TRADING_PAIRS)
+FEE_ADJUSTED_MIN_BY_PAIR = tuple(FEE_ADJUSTED_MIN_VALUES.get(s, FEE_ADJUSTED_MIN_VALUES['DEFAULT']) for s in TRADING_PAIRS)
+
 # Position sizing based on conviction level
 USE_CONVICTION_SIZING = True  # Enable position sizing based on signal strength
 MIN_CONVICTION_THRESHOLD = 0.65  # Only take trades with conviction above this value
@@ -125,6 +146,21 @@ CONVICTION_MULTIPLIERS = {
     1.0: 1.2    # 120% of standard position size for maximum conviction
 }
 
+# Sorted lookup table so a conviction score maps to its band with one bisect
+_CONVICTION_THRESHOLDS = tuple(sorted(CONVICTION_MULTIPLIERS))
+_CONVICTION_VALUES = tuple(CONVICTION_MULTIPLIERS[t] for t in _CONVICTION_THRESHOLDS)
+
+def conviction_multiplier(conviction):
+    """Return the position size multiplier for the highest threshold <= conviction."""
+    i = bisect_right(_CONVICTION_THRESHOLDS, conviction) - 1
+    return _CONVICTION_VALUES[max(0, i)]
+
+# Process supervision - run_bot.py restarts itself once its memory use passes this.
+# Off by default: the restart interrupts the trading loop like Ctrl+C at whatever
+# line it is on, which can fall between placing an order and recording it.
+RESTART_RSS_MB = 0  # MB, e.g. 1024; 0 disables
+RSS_CHECK_INTERVAL = 60  # Seconds between memory checks
+
 # Testing mode flag
 TESTING_MODE = True  # Set to False in production
 
@@ -133,13 +169,23 @@ BASE_LOG_DIR = os.path.dirname(LOG_FILE) if os.path.dirname(LOG_FILE) else "."
 SCAN_LOGS_DIR = os.path.join(BASE_LOG_DIR, "scans")
 TRADE_LOGS_DIR = BASE_DIR  # Store in bot main directory for easier access
 
-# Ensure log directories exist
-for directory in [BASE_LOG_DIR, SCAN_LOGS_DIR, TRADE_LOGS_DIR]:
-   os.makedirs(directory, exist_ok=True)
+# Directories are created on demand by ensure_dirs() rather than on import
+_dirs_created = False
+
+def ensure_dirs():
+    """Create the bot's log and data directories once per process."""
+    global _dirs_created
+    if _dirs_created:
+        return
+    # SCAN_LOGS_DIR is nested under LOG_DIR/BASE_LOG_DIR, so creating it covers both
+    for directory in (SCAN_LOGS_DIR, DATA_DIR, TRADE_LOGS_DIR):
+        os.makedirs(directory, exist_ok=True)
+    _dirs_created = True
 
 # Detailed logging settings
 LOG_LEVEL = "INFO"
 DETAILED_SCAN_LOGGING = True  # Enable detailed scan logging
+SCAN_LOG_FORMAT = "csv"  # "csv" or "msgpack" (smaller and faster; needs the msgpack package)
 
 # Market condition filters - ADJUSTED for more opportunities
 MARKET_VOLATILITY_MIN = 0.15  # Lowered minimum volatility to catch more opportunities
@@ -1,6 +1,10 @@
 import streamlit as st
+import io
+import os
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
 # Set page config
@@ -10,25 +14,94 @@ st.set_page_config(
     layout="wide"
 )
 
+TRADE_LOG_FILE = 'trade_log.csv'
+
+# Columns read from the trade log (anything else in the file is skipped)
+TRADE_COLUMNS = ['timestamp', 'pair', 'action', 'price', 'quantity', 'strategy', 'pnl', 'pnl_pct']
+
+# Parse raw trade log bytes (the header row must be the first line of data)
+def _parse_trade_csv(data):
+    return pd.read_csv(io.BytesIO(data), engine='pyarrow',
+                       usecols=TRADE_COLUMNS, parse_dates=['timestamp'])
+
 # Load trade data
-@st.cache_data(ttl=30)  # Cache for 30 seconds
+# The trade log is append-only, so keep the parsed frame and the byte offset
+# already read in session state and only parse newly appended lines.
+# If the file shrank (rotated/truncated) it is read again from the start.
+# Appended chunks are parsed with the saved header line in front of them.
 def load_trade_data():
+    state = st.session_state
     try:
-        df = pd.read_csv('trade_log.csv')
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        return df
+        offset = state.get('csv_off', 0)
+        if 'df' not in state or os.path.getsize(TRADE_LOG_FILE) < offset:
+            offset = 0
+        
+        with open(TRADE_LOG_FILE, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        
+        # Only consume up to the last complete line
+        data = data[:data.rfind(b'\n') + 1]
+        
+        if offset == 0:
+            state['csv_header'] = data[:data.find(b'\n') + 1]
+            state['df'] = _parse_trade_csv(data)
+        elif data:
+            new_rows = _parse_trade_csv(state['csv_header'] + data)
+            state['df'] = pd.concat([state['df'], new_rows], ignore_index=True)
+        
+        state['csv_off'] = offset + len(data)
+        return state['df']
     except Exception as e:
         st.error(f"Error loading trade data: {e}")
         return pd.DataFrame()
 
+# Percentage of winning trades, counted without building a filtered frame
+def calculate_win_rate(pnl):
+    pnl = pnl.to_numpy()
+    wins = int(np.count_nonzero(pnl > 0))
+    return wins / pnl.size * 100 if pnl.size else 0
+
 # Calculate metrics for a specific strategy
 def calculate_strategy_metrics(df, strategy):
     strategy_df = df[df['strategy'] == strategy]
     total_trades = len(strategy_df)
     total_pnl = strategy_df['pnl'].sum()
-    win_rate = len(strategy_df[strategy_df['pnl'] > 0]) / total_trades * 100 if total_trades > 0 else 0
+    win_rate = calculate_win_rate(strategy_df['pnl'])
     return total_trades, total_pnl, win_rate
 
+# Per-strategy totals in one named aggregation; the frame itself is not
+# hashed (leading underscore), the cache is keyed on the number of trades
+@st.cache_data(ttl=30)
+def calculate_strategy_performance(_df, n_trades):
+    return (_df.groupby('strategy', sort=False)
+               .agg(**{'Total P&L': ('pnl', 'sum'),
+                       'Avg P&L %': ('pnl_pct', 'mean'),
+                       'Number of Trades': ('pair', 'size')})
+               .reset_index()
+               .rename(columns={'strategy': 'Strategy'}))
+
+# Cumulative P&L line chart drawn with WebGL; long histories are downsampled
+# to MAX_CHART_POINTS and cached per chart until the number of trades changes
+MAX_CHART_POINTS = 2000
+
+def cumulative_pnl_chart(key, timestamps, cumulative_pnl, title):
+    cache = st.session_state.setdefault('chart_cache', {})
+    n = len(timestamps)
+    cached = cache.get(key)
+    if cached is None or cached[0] != n:
+        ts = timestamps.to_numpy()
+        cum = cumulative_pnl.to_numpy()
+        if n > MAX_CHART_POINTS:
+            idx = np.linspace(0, n - 1, MAX_CHART_POINTS, dtype=int)
+            ts, cum = ts[idx], cum[idx]
+        cached = cache[key] = (n, ts, cum)
+    
+    _, ts, cum = cached
+    fig = go.Figure(go.Scattergl(x=ts, y=cum, mode='lines'))
+    fig.update_layout(title=title, xaxis_title='timestamp', yaxis_title='cumulative_pnl')
+    return fig
+
 # Main dashboard
 def main():
     st.title("Trading Dashboard")
@@ -40,8 +113,15 @@ def main():
         st.warning("No trade data available")
         return
     
-    # Get unique strategies
-    strategies = df['strategy'].unique()
+    # Sort once and compute running totals in a single pass; sort_values
+    # returns a new frame, so the one kept in session state is untouched
+    df = df.sort_values('timestamp', kind='stable')
+    df['cumulative_pnl'] = df['pnl'].cumsum()
+    df['strategy_cumulative_pnl'] = df.groupby('strategy', sort=False)['pnl'].cumsum()
+    
+    # Split by strategy once and reuse the sub-frames in every tab
+    groups = dict(list(df.groupby('strategy', sort=False)))
+    strategies = list(groups)
     
     # Create tabs for each strategy
     tabs = st.tabs(["All Strategies"] + [f"Strategy: {s}" for s in strategies])
@@ -62,24 +142,18 @@ def main():
             st.metric("Total P&L", f"${total_pnl:.2f}")
         
         with col3:
-            win_rate = len(df[df['pnl'] > 0]) / len(df) * 100 if len(df) > 0 else 0
+            win_rate = calculate_win_rate(df['pnl'])
             st.metric("Overall Win Rate", f"{win_rate:.1f}%")
         
         # Strategy comparison
         st.subheader("Strategy Performance Comparison")
-        strategy_performance = df.groupby('strategy').agg({
-            'pnl': 'sum',
-            'pnl_pct': 'mean',
-            'pair': 'count'
-        }).reset_index()
-        strategy_performance.columns = ['Strategy', 'Total P&L', 'Avg P&L %', 'Number of Trades']
+        strategy_performance = calculate_strategy_performance(df, len(df))
         st.dataframe(strategy_performance)
         
         # Overall P&L chart
         st.subheader("Overall Cumulative P&L")
-        df['cumulative_pnl'] = df['pnl'].cumsum()
-        fig = px.line(df, x='timestamp', y='cumulative_pnl', 
-                     title="Cumulative Profit/Loss (All Strategies)")
+        fig = cumulative_pnl_chart(None, df['timestamp'], df['cumulative_pnl'],
+                                   "Cumulative Profit/Loss (All Strategies)")
         st.plotly_chart(fig, use_container_width=True)
     
     # Individual Strategy Tabs
@@ -87,8 +161,8 @@ def main():
         with tabs[i]:
             st.header(f"Strategy: {strategy}")
             
-            # Filter data for this strategy
-            strategy_df = df[df['strategy'] == strategy]
+            # Data for this strategy
+            strategy_df = groups[strategy]
             
             # Key metrics for this strategy
             col1, col2, col3 = st.columns(3)
@@ -102,7 +176,7 @@ def main():
                 st.metric("Total P&L", f"${total_pnl:.2f}")
             
             with col3:
-                win_rate = len(strategy_df[strategy_df['pnl'] > 0]) / total_trades * 100 if total_trades > 0 else 0
+                win_rate = calculate_win_rate(strategy_df['pnl'])
                 st.metric("Win Rate", f"{win_rate:.1f}%")
             
             # Recent trades for this strategy
@@ -111,9 +185,9 @@ def main():
             
             # Strategy P&L chart
             st.subheader("Strategy Cumulative P&L")
-            strategy_df['cumulative_pnl'] = strategy_df['pnl'].cumsum()
-            fig = px.line(strategy_df, x='timestamp', y='cumulative_pnl', 
-                         title=f"Cumulative Profit/Loss ({strategy})")
+            fig = cumulative_pnl_chart(strategy, strategy_df['timestamp'],
+                                       strategy_df['strategy_cumulative_pnl'],
+                                       f"Cumulative Profit/Loss ({strategy})")
             st.plotly_chart(fig, use_container_width=True)
             
             # Performance by pair for this strategy
@@ -3,27 +3,276 @@ database.py - SQL database module for the trading bot
 """
 
 import os
+import csv
+import sys
+import json
+import math
+import time
+import calendar
+import queue
+import atexit
 import sqlite3
-import pandas as pd
 import logging
-from datetime import datetime
+import threading
+import pandas as pd
+from functools import lru_cache, wraps
+
+# orjson is optional; it is several times faster than json for indicator dicts
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Get logger
 logger = logging.getLogger('crypto_bot.database')
 
+# Timestamps are stored as INTEGER Unix epoch seconds (UTC); this is the text
+# form used for created_at, date filters and exported files
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Trade columns written by export_to_csv, in file order
+_EXPORT_COLUMNS = ['timestamp', 'pair', 'action', 'price', 'quantity',
+                   'net_profit', 'profit_pct', 'order_id', 'strategy']
+_EXPORT_SELECT = ", ".join(
+    f"strftime('{_TIMESTAMP_FORMAT}', timestamp, 'unixepoch') AS timestamp" if col == 'timestamp' else col
+    for col in _EXPORT_COLUMNS
+)
+
+# SQLite 3.45+ stores indicators as binary JSONB; older versions keep JSON text.
+# Legacy text rows need no migration: they are read back as stored and parsed
+# in Python like before, and only valid JSONB is passed to json(), since one
+# malformed value would fail the whole query (it is read as NULL, i.e. {}).
+_HAS_JSONB = sqlite3.sqlite_version_info >= (3, 45, 0)
+_INDICATORS_TYPE = 'BLOB' if _HAS_JSONB else 'TEXT'
+# Text that is not strict JSON (NaN/Infinity from json.dumps) is stored as-is,
+# since json() would render a JSONB NaN as null
+_INDICATORS_PARAM = 'iif(json_valid(?7, 1), jsonb(?7), ?7)' if _HAS_JSONB else '?'
+_SCAN_SELECT = ("id, timestamp, pair, signal, price, strategy, interval, "
+                "CASE WHEN typeof(indicators) = 'text' THEN indicators "
+                "WHEN json_valid(indicators, 8) THEN json(indicators) END AS indicators, "
+                "created_at") if _HAS_JSONB else "*"
+
+# Table definitions, also used to rebuild tables during migration
+_TABLE_DDL = {
+    'trades': '''
+    CREATE TABLE IF NOT EXISTS trades (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        pair TEXT NOT NULL,
+        action TEXT NOT NULL,
+        price REAL NOT NULL,
+        quantity REAL NOT NULL,
+        net_profit REAL,
+        profit_pct REAL,
+        order_id TEXT,
+        strategy TEXT,
+        created_at TEXT NOT NULL
+    )
+    ''',
+    'market_scans': f'''
+    CREATE TABLE IF NOT EXISTS market_scans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        pair TEXT NOT NULL,
+        signal TEXT,
+        price REAL,
+        strategy TEXT,
+        interval TEXT,
+        indicators {_INDICATORS_TYPE},
+        created_at TEXT NOT NULL
+    )
+    ''',
+    'bot_status': '''
+    CREATE TABLE IF NOT EXISTS bot_status (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        account_value REAL,
+        active_pairs TEXT,
+        message TEXT,
+        created_at TEXT NOT NULL
+    )
+    ''',
+    # One row per active pair of a bot_status entry; replaces the old
+    # comma-joined active_pairs column, which is kept only for legacy rows
+    'bot_status_pairs': '''
+    CREATE TABLE IF NOT EXISTS bot_status_pairs (
+        status_id INTEGER NOT NULL REFERENCES bot_status(id),
+        pair TEXT NOT NULL
+    )
+    ''',
+}
+
+# Insert statements for the hot logging path, kept as constants so every call
+# hands sqlite3 the identical SQL text and hits its prepared-statement cache
+_INSERT_TRADE_SQL = """
+INSERT INTO trades (timestamp, pair, action, price, quantity, net_profit, profit_pct, order_id, strategy, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_SCAN_SQL = f"""
+INSERT INTO market_scans (timestamp, pair, signal, price, strategy, interval, indicators, created_at)
+VALUES (?, ?, ?, ?, ?, ?, {_INDICATORS_PARAM}, ?)
+"""
+
+_INSERT_STATUS_SQL = """
+INSERT INTO bot_status (timestamp, status, account_value, message, created_at)
+VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_STATUS_PAIR_SQL = "INSERT INTO bot_status_pairs (status_id, pair) VALUES (?, ?)"
+
+# Status IDs per bot_status_pairs lookup; older SQLite builds allow only 999 parameters
+_STATUS_PAIRS_CHUNK = 900
+
+# Window functions (SQLite 3.25+) let get_trades compute running profit in SQL
+_HAS_WINDOW_FUNCTIONS = sqlite3.sqlite_version_info >= (3, 25, 0)
+_CUMULATIVE_PROFIT_SQL = "SUM(COALESCE(net_profit, 0)) OVER (ORDER BY timestamp, id ROWS UNBOUNDED PRECEDING)"
+if not _HAS_WINDOW_FUNCTIONS:
+    logger.warning(f"SQLite {sqlite3.sqlite_version} has no window functions; "
+                   "cumulative profit will be computed in pandas")
+
+# WHERE fragments for the get_* filters, keyed by filter name
+_FILTER_SQL = {
+    'pair': "pair = ?",
+    'action': "action = ?",
+    'signal': "signal = ?",
+    'status': "status = ?",
+    'start_date': "timestamp >= ?",
+    'end_date': "timestamp <= ?",
+}
+
+@lru_cache(maxsize=None)
+def _build_select(table, filters):
+    """
+    Build the SELECT used by a get_* method for a given set of filters.
+    
+    Each filter combination always maps to the same SQL text, so sqlite3
+    reuses its prepared statement instead of re-parsing. Filters stay as
+    plain "col = ?" predicates (rather than "? IS NULL OR col = ?") so the
+    (pair, timestamp) indexes can still be used. LIMIT is always bound;
+    -1 means no limit.
+    """
+    where = "".join(f" AND {_FILTER_SQL[name]}" for name in filters)
+    
+    # Running profit is computed by SQLite over all matching trades
+    # (oldest first) before the newest-first ordering and LIMIT apply
+    if table == 'trades' and _HAS_WINDOW_FUNCTIONS:
+        return (f"SELECT * FROM (SELECT *, {_CUMULATIVE_PROFIT_SQL} AS cumulative_net_profit "
+                f"FROM trades WHERE 1=1{where}) ORDER BY timestamp DESC, id DESC LIMIT ?")
+    if table == 'trades':
+        return f"SELECT * FROM trades WHERE 1=1{where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+    if table == 'market_scans':
+        return f"SELECT {_SCAN_SELECT} FROM market_scans WHERE 1=1{where} ORDER BY timestamp DESC LIMIT ?"
+    return f"SELECT * FROM {table} WHERE 1=1{where} ORDER BY timestamp DESC LIMIT ?"
+
+# Connections may be used from any thread; TradingDatabase serializes access
+# with its own lock. Larger statement cache; older interpreters affected by
+# CPython gh-118172 keep the default size.
+_CONNECT_KWARGS = {'check_same_thread': False}
+if sys.version_info >= (3, 13):
+    _CONNECT_KWARGS['cached_statements'] = 256
+
+def _locked(method):
+    """Run a TradingDatabase method while holding the instance's connection lock."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+def _utc_now():
+    """Return the current time as (epoch seconds, UTC text for created_at)."""
+    now = int(time.time())
+    return now, _format_epoch(now)
+
+def _format_epoch(seconds):
+    """Format epoch seconds as 'YYYY-MM-DD HH:MM:SS' (UTC)."""
+    # f-string over the gmtime fields; strftime is slow for the log_* hot path
+    t = time.gmtime(seconds)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}")
+
+def _to_epoch(text):
+    """Parse a 'YYYY-MM-DD HH:MM:SS' (UTC) string into epoch seconds."""
+    return calendar.timegm(time.strptime(text, _TIMESTAMP_FORMAT))
+
+def _has_non_finite(indicators):
+    """Return True if any indicator value is NaN or infinite."""
+    for value in indicators.values():
+        try:
+            if not math.isfinite(value):
+                return True
+        except TypeError:
+            pass  # not a number
+    return False
+
+def _dump_indicators(indicators):
+    """Encode an indicators dict as JSON text, using orjson when installed."""
+    if orjson is None:
+        return json.dumps(indicators)
+    try:
+        data = orjson.dumps(indicators, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    except TypeError:
+        return json.dumps(indicators)  # types orjson can't encode; let json handle or reject them
+    # orjson writes NaN/Infinity as null; json.dumps keeps them so they read back as nan/inf
+    if b'null' in data and _has_non_finite(indicators):
+        try:
+            return json.dumps(indicators)
+        except TypeError:
+            pass  # e.g. numpy float32, which only orjson encodes
+    return data.decode()
+
+def _parse_indicators(value):
+    """Decode a stored indicators JSON string, returning {} if empty or invalid."""
+    if not isinstance(value, str) or not value:
+        return {}
+    if orjson is not None:
+        try:
+            return orjson.loads(value)
+        except ValueError:
+            pass  # e.g. NaN written by json.dumps, which orjson rejects
+    try:
+        return json.loads(value)
+    except ValueError:
+        return {}
+
 class TradingDatabase:
     """
     Database handler for storing and retrieving trading data.
-    Uses SQLite for local storage.
+    Uses SQLite for local storage. One instance can be shared between
+    threads; calls that touch the connection are serialized by a lock.
+    
+    Use it as a context manager so the connection is always closed:
+    
+        with TradingDatabase("trading_bot.db") as db:
+            db.log_trade("BTCUSDT", "BUY", 50000.0, 0.1)
     """
     
-    def __init__(self, db_file=None):
+    def __init__(self, db_file=None, journal_mode="WAL", synchronous="NORMAL",
+                 temp_store="MEMORY", mmap_size=268435456, cache_size=-65536,
+                 batch_writes=True, batch_size=500, flush_interval_ms=500,
+                 wal_autocheckpoint=1000):
         """
         Initialize the database connection.
         
         Args:
             db_file (str, optional): Path to the SQLite database file.
                 If None, 'trading_bot.db' in the current directory is used.
+            journal_mode (str, optional): SQLite journal mode. Defaults to 'WAL'.
+            synchronous (str, optional): SQLite synchronous level. Defaults to 'NORMAL';
+                use 'FULL' if every commit must survive a power loss.
+            temp_store (str, optional): Where SQLite keeps temporary tables. Defaults to 'MEMORY'.
+            mmap_size (int, optional): Bytes of the file to memory-map. Defaults to 256 MB.
+            cache_size (int, optional): Page cache size (negative means KiB). Defaults to 64 MB.
+            batch_writes (bool, optional): Queue market scans and non-error status entries
+                and write them from a background thread. Defaults to True; always
+                off for an in-memory database.
+            batch_size (int, optional): Maximum rows per background write. Defaults to 500.
+            flush_interval_ms (int, optional): Longest time a queued row waits before
+                being written. Defaults to 500.
+            wal_autocheckpoint (int, optional): WAL size in pages that triggers an
+                automatic checkpoint. Defaults to 1000.
         """
         # Use default path if none provided
         if db_file is None:
@@ -32,6 +281,23 @@ class TradingDatabase:
         
         self.db_file = db_file
         self.conn = None
+        self._lock = threading.RLock()
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.temp_store = temp_store
+        self.mmap_size = mmap_size
+        self.cache_size = cache_size
+        self.wal_autocheckpoint = wal_autocheckpoint
+        
+        # Background writer state (started on the first queued write).
+        # The writer opens its own connection, which for an in-memory database
+        # would be a separate, empty one, so those always write directly.
+        self.batch_writes = batch_writes and db_file not in (':memory:', '')
+        self.batch_size = batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self._queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
         
         # Initialize connection and tables
         try:
@@ -42,78 +308,209 @@ class TradingDatabase:
             logger.error(f"Database initialization error: {str(e)}")
             raise
     
+    def _open_connection(self):
+        """Open a new SQLite connection with the configured PRAGMAs applied."""
+        conn = sqlite3.connect(self.db_file, **_CONNECT_KWARGS)
+        # Enable foreign keys
+        conn.execute("PRAGMA foreign_keys = ON")
+        
+        # WAL + synchronous=NORMAL avoids a full fsync on every commit
+        # and lets readers run while the bot is writing
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {int(self.wal_autocheckpoint)}")
+        return conn
+    
+    @_locked
     def connect(self):
         """Connect to the SQLite database."""
         try:
-            self.conn = sqlite3.connect(self.db_file)
-            # Enable foreign keys
-            self.conn.execute("PRAGMA foreign_keys = ON")
-            logger.info(f"Connected to database: {self.db_file}")
+            self.conn = self._open_connection()
+            journal_mode = self.conn.execute("PRAGMA journal_mode").fetchone()[0]
+            logger.info(f"Connected to database: {self.db_file} (journal_mode={journal_mode})")
         except Exception as e:
             logger.error(f"Database connection error: {str(e)}")
             raise
     
+    def _enqueue(self, sql, params, pairs=None):
+        """
+        Queue a row for the background writer, starting it if needed.
+        
+        Args:
+            sql (str): Insert statement for the row
+            params (tuple): Bound parameters for the row
+            pairs (list, optional): Active pairs to write to bot_status_pairs
+                under the new row's ID. Defaults to None.
+        """
+        if self._writer is None or not self._writer.is_alive():
+            with self._writer_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._flush_loop,
+                                                    name="db-writer", daemon=True)
+                    self._writer.start()
+                    atexit.register(self.flush)
+        self._queue.put((sql, params, pairs))
+    
+    def _flush_loop(self):
+        """
+        Background writer: collect queued rows until batch_size is reached or
+        flush_interval_ms has passed, then write them in one transaction.
+        
+        Uses its own connection, so a batch being written does not hold the
+        instance lock that reads and direct writes wait on. A None item stops
+        the loop; a threading.Event item is set once everything queued before
+        it has been written.
+        """
+        conn = self._open_connection()
+        try:
+            stop = False
+            while not stop:
+                item = self._queue.get()
+                batch = []
+                waiters = []
+                deadline = time.monotonic() + self.flush_interval_ms / 1000
+                while True:
+                    if item is None:
+                        stop = True
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                        break
+                    batch.append(item)
+                    timeout = deadline - time.monotonic()
+                    if len(batch) >= self.batch_size or timeout <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                
+                self._write_batch(conn, batch)
+                for waiter in waiters:
+                    waiter.set()
+        finally:
+            conn.close()
+    
+    def _write_batch(self, conn, batch):
+        """Write queued (sql, params, pairs) rows with one executemany per statement."""
+        if not batch:
+            return
+        
+        grouped = {}
+        with_pairs = []
+        for sql, params, pairs in batch:
+            if pairs:
+                # Needs its own execute so the child rows can use lastrowid
+                with_pairs.append((sql, params, pairs))
+            else:
+                grouped.setdefault(sql, []).append(params)
+        
+        try:
+            with conn:
+                for sql, rows in grouped.items():
+                    conn.executemany(sql, rows)
+                for sql, params, pairs in with_pairs:
+                    self._write_row(conn, sql, params, pairs)
+            logger.debug("Wrote %d queued log entries to database", len(batch))
+        except Exception as e:
+            # Retry one row per transaction so a single bad row is the only one lost
+            logger.warning(f"Batch write failed ({str(e)}), retrying {len(batch)} entries one at a time")
+            for sql, params, pairs in batch:
+                try:
+                    with conn:
+                        self._write_row(conn, sql, params, pairs)
+                except Exception as e:
+                    logger.error(f"Error writing queued log entry to database: {str(e)}, params: {params!r}")
+    
+    def _write_row(self, conn, sql, params, pairs):
+        """Insert one queued row, plus its bot_status_pairs rows if it has any."""
+        cursor = conn.execute(sql, params)
+        if pairs:
+            conn.executemany(_INSERT_STATUS_PAIR_SQL,
+                             [(cursor.lastrowid, pair) for pair in pairs])
+    
+    @_locked
+    def flush(self):
+        """Block until every queued log entry has been written."""
+        # Holding the lock keeps close() from queuing its stop sentinel ahead
+        # of our Event, which would leave it unset and this call waiting forever
+        if self._writer is not None and self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+    
+    @_locked
     def close(self):
-        """Close the database connection."""
+        """Flush queued writes and close the database connection."""
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._writer = None
+        
         if self.conn:
+            # Let SQLite refresh statistics the session's queries would benefit from
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA optimize failed on close: {str(e)}")
             self.conn.close()
             self.conn = None
             logger.info("Database connection closed")
     
+    @_locked
+    def maintenance(self):
+        """
+        Checkpoint and truncate the WAL file and refresh planner statistics.
+        
+        Meant to be called periodically (e.g. once a day) by long-running bots.
+        """
+        try:
+            # Ensure connection is active
+            if not self.conn:
+                self.connect()
+            
+            # Get queued rows into the database before checkpointing
+            self.flush()
+            
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("ANALYZE")
+            self.conn.commit()
+            logger.info("Database maintenance completed")
+        except Exception as e:
+            logger.error(f"Error running database maintenance: {str(e)}")
+    
+    @_locked
     def create_tables(self):
         """Create necessary database tables if they don't exist."""
         try:
-            cursor = self.conn.cursor()
-            
-            # Create trades table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS trades (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                pair TEXT NOT NULL,
-                action TEXT NOT NULL,
-                price REAL NOT NULL,
-                quantity REAL NOT NULL,
-                net_profit REAL,
-                profit_pct REAL,
-                order_id TEXT,
-                strategy TEXT,
-                created_at TEXT NOT NULL
-            )
-            ''')
-            
-            # Create market_scans table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS market_scans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                pair TEXT NOT NULL,
-                signal TEXT,
-                price REAL,
-                strategy TEXT,
-                interval TEXT,
-                indicators TEXT,
-                created_at TEXT NOT NULL
-            )
-            ''')
-            
-            # Create bot_status table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS bot_status (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                status TEXT NOT NULL,
-                account_value REAL,
-                active_pairs TEXT,
-                message TEXT,
-                created_at TEXT NOT NULL
-            )
-            ''')
+            # Rebuild tables from before timestamps were INTEGER
+            self._migrate_text_timestamps()
+            
+            # Create trades, market_scans, bot_status and bot_status_pairs tables
+            for ddl in _TABLE_DDL.values():
+                self.conn.execute(ddl)
             
             # Create index on timestamp for faster queries
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_trades_pair ON trades(pair)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_market_scans_timestamp ON market_scans(timestamp)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_market_scans_timestamp ON market_scans(timestamp)')
+            
+            # Composite (pair, timestamp DESC) indexes serve "latest rows for a pair"
+            # queries with a single index seek, no sort. They also cover plain
+            # pair lookups, so the old single-column idx_trades_pair is dropped.
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_trades_pair_ts ON trades(pair, timestamp DESC)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_market_scans_pair_ts ON market_scans(pair, timestamp DESC)')
+            self.conn.execute('DROP INDEX IF EXISTS idx_trades_pair')
+            
+            # Pairs are read back per status entry, and searched by pair
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_bot_status_pairs_status ON bot_status_pairs(status_id)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_bot_status_pairs_pair ON bot_status_pairs(pair)')
+            
+            # Gather planner statistics once so the new indexes get picked
+            if self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone() is None:
+                self.conn.execute('ANALYZE')
             
             self.conn.commit()
             logger.info("Database tables created successfully")
@@ -121,6 +518,37 @@ class TradingDatabase:
             logger.error(f"Error creating database tables: {str(e)}")
             raise
     
+    def _migrate_text_timestamps(self):
+        """
+        One-shot migration for databases that store timestamp as TEXT.
+        
+        SQLite cannot change a column type in place, so each affected table is
+        renamed, recreated with the INTEGER schema, refilled with the
+        'YYYY-MM-DD HH:MM:SS' (UTC) values converted to epoch seconds, and the
+        old copy dropped. Each table is migrated in its own transaction.
+        """
+        for table, ddl in _TABLE_DDL.items():
+            info = self.conn.execute(f"PRAGMA table_info({table})").fetchall()
+            column_types = {row[1]: row[2].upper() for row in info}
+            if column_types.get('timestamp') != 'TEXT':
+                continue
+            
+            columns = ", ".join(column_types)
+            select = ", ".join("CAST(strftime('%s', timestamp) AS INTEGER)" if col == 'timestamp' else col
+                               for col in column_types)
+            try:
+                self.conn.execute("BEGIN")
+                self.conn.execute(f"ALTER TABLE {table} RENAME TO {table}_text_ts")
+                self.conn.execute(ddl)
+                self.conn.execute(f"INSERT INTO {table} ({columns}) SELECT {select} FROM {table}_text_ts")
+                self.conn.execute(f"DROP TABLE {table}_text_ts")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+            logger.info(f"Migrated {table}.timestamp to INTEGER epoch seconds")
+    
+    @_locked
     def log_trade(self, pair, action, price, quantity, net_profit=None, profit_pct=None, order_id=None, strategy=None):
         """
         Log a trade to the database.
@@ -143,13 +571,9 @@ class TradingDatabase:
             if not self.conn:
                 self.connect()
             
-            cursor = self.conn.cursor()
-            timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp, created_at = _utc_now()
             
-            cursor.execute('''
-            INSERT INTO trades (timestamp, pair, action, price, quantity, net_profit, profit_pct, order_id, strategy, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            cursor = self.conn.execute(_INSERT_TRADE_SQL, (
                 timestamp,
                 pair,
                 action,
@@ -159,12 +583,12 @@ class TradingDatabase:
                 profit_pct,
                 order_id,
                 strategy,
-                timestamp  # created_at is the same as timestamp for new entries
+                created_at  # same instant as timestamp for new entries
             ))
             
             self.conn.commit()
             trade_id = cursor.lastrowid
-            logger.info(f"Trade logged to database: {pair} {action} @ {price}, ID: {trade_id}")
+            logger.info("Trade logged to database: %s %s @ %s, ID: %s", pair, action, price, trade_id)
             
             return trade_id
         except Exception as e:
@@ -173,6 +597,7 @@ class TradingDatabase:
                 self.conn.rollback()
             raise
     
+    @_locked
     def log_market_scan(self, pair, signal, price, strategy=None, interval=None, indicators=None):
         """
         Log a market scan to the database.
@@ -186,26 +611,18 @@ class TradingDatabase:
             indicators (dict, optional): Dictionary of indicator values. Defaults to None.
             
         Returns:
-            int: The ID of the inserted scan
+            int: The ID of the inserted scan, or None if the scan was queued
+                for the background writer
         """
         try:
-            # Ensure connection is active
-            if not self.conn:
-                self.connect()
-            
-            cursor = self.conn.cursor()
-            timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp, created_at = _utc_now()
             
-            # Convert indicators dict to string if provided
+            # Convert indicators dict to JSON text; SQLite encodes it to JSONB if supported
             indicators_str = None
             if indicators:
-                import json
-                indicators_str = json.dumps(indicators)
+                indicators_str = _dump_indicators(indicators)
             
-            cursor.execute('''
-            INSERT INTO market_scans (timestamp, pair, signal, price, strategy, interval, indicators, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
+            params = (
                 timestamp,
                 pair,
                 signal,
@@ -213,12 +630,23 @@ class TradingDatabase:
                 strategy,
                 interval,
                 indicators_str,
-                timestamp  # created_at is the same as timestamp for new entries
-            ))
+                created_at  # same instant as timestamp for new entries
+            )
+            
+            # Scans are high volume, so batch them unless disabled
+            if self.batch_writes:
+                self._enqueue(_INSERT_SCAN_SQL, params)
+                return None
+            
+            # Ensure connection is active
+            if not self.conn:
+                self.connect()
+            
+            cursor = self.conn.execute(_INSERT_SCAN_SQL, params)
             
             self.conn.commit()
             scan_id = cursor.lastrowid
-            logger.info(f"Market scan logged to database: {pair} {signal} @ {price}, ID: {scan_id}")
+            logger.info("Market scan logged to database: %s %s @ %s, ID: %s", pair, signal, price, scan_id)
             
             return scan_id
         except Exception as e:
@@ -227,6 +655,7 @@ class TradingDatabase:
                 self.conn.rollback()
             raise
     
+    @_locked
     def log_bot_status(self, status, account_value=None, active_pairs=None, message=None):
         """
         Log the bot's status to the database.
@@ -238,39 +667,44 @@ class TradingDatabase:
             message (str, optional): Optional status message. Defaults to None.
             
         Returns:
-            int: The ID of the inserted status entry
+            int: The ID of the inserted status entry, or None if the entry was
+                queued for the background writer
         """
         try:
-            # Ensure connection is active
-            if not self.conn:
-                self.connect()
-            
-            cursor = self.conn.cursor()
-            timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+            timestamp, created_at = _utc_now()
             
-            # Convert active_pairs list to string if provided
-            active_pairs_str = None
+            # Active pairs go to bot_status_pairs, one row each
+            pairs = []
             if active_pairs:
-                if isinstance(active_pairs, list):
-                    active_pairs_str = ','.join(active_pairs)
+                if isinstance(active_pairs, (list, tuple)):
+                    pairs = [str(pair) for pair in active_pairs]
                 else:
-                    active_pairs_str = str(active_pairs)
+                    pairs = str(active_pairs).split(',')
             
-            cursor.execute('''
-            INSERT INTO bot_status (timestamp, status, account_value, active_pairs, message, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ''', (
+            params = (
                 timestamp,
                 status,
                 account_value,
-                active_pairs_str,
                 message,
-                timestamp  # created_at is the same as timestamp for new entries
-            ))
+                created_at  # same instant as timestamp for new entries
+            )
+            
+            # ERROR entries are written immediately so they survive a crash
+            if self.batch_writes and status != 'ERROR':
+                self._enqueue(_INSERT_STATUS_SQL, params, pairs)
+                return None
+            
+            # Ensure connection is active
+            if not self.conn:
+                self.connect()
+            
+            status_id = self.conn.execute(_INSERT_STATUS_SQL, params).lastrowid
+            if pairs:
+                self.conn.executemany(_INSERT_STATUS_PAIR_SQL,
+                                   [(status_id, pair) for pair in pairs])
             
             self.conn.commit()
-            status_id = cursor.lastrowid
-            logger.info(f"Bot status logged to database: {status}, ID: {status_id}")
+            logger.info("Bot status logged to database: %s, ID: %s", status, status_id)
             
             return status_id
         except Exception as e:
@@ -279,6 +713,17 @@ class TradingDatabase:
                 self.conn.rollback()
             raise
     
+    def _query_df(self, query, params):
+        """Run a SELECT and return the rows as a DataFrame with parsed timestamps."""
+        cursor = self.conn.execute(query, params)
+        df = pd.DataFrame.from_records(cursor.fetchall(),
+                                       columns=[col[0] for col in cursor.description])
+        
+        # Epoch seconds convert to datetimes without any string parsing
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+        return df
+    
+    @_locked
     def get_trades(self, pair=None, action=None, start_date=None, end_date=None, limit=None):
         """
         Get trades from the database with optional filtering.
@@ -298,40 +743,34 @@ class TradingDatabase:
             if not self.conn:
                 self.connect()
             
-            # Build query
-            query = "SELECT * FROM trades WHERE 1=1"
+            # Build filters
+            filters = []
             params = []
             
             if pair:
-                query += " AND pair = ?"
+                filters.append('pair')
                 params.append(pair)
             
             if action:
-                query += " AND action = ?"
+                filters.append('action')
                 params.append(action)
             
             if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date} 00:00:00")
+                filters.append('start_date')
+                params.append(_to_epoch(f"{start_date} 00:00:00"))
             
             if end_date:
-                query += " AND timestamp <= ?"
-                params.append(f"{end_date} 23:59:59")
+                filters.append('end_date')
+                params.append(_to_epoch(f"{end_date} 23:59:59"))
             
-            query += " ORDER BY timestamp DESC"
-            
-            if limit:
-                query += " LIMIT ?"
-                params.append(limit)
+            params.append(limit or -1)
+            query = _build_select('trades', tuple(filters))
             
             # Execute query and return as DataFrame
-            df = pd.read_sql_query(query, self.conn, params=params)
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df = self._query_df(query, params)
             
-            # Calculate cumulative profit
-            if not df.empty and 'net_profit' in df.columns:
+            # Calculate cumulative profit (SQLite < 3.25 has no window functions)
+            if not _HAS_WINDOW_FUNCTIONS and not df.empty and 'net_profit' in df.columns:
                 # Sort by timestamp (oldest first) for proper cumulative calculation
                 df_sorted = df.sort_values('timestamp')
                 
@@ -341,12 +780,32 @@ class TradingDatabase:
                 # Resort to original order
                 df = df_sorted.sort_values('timestamp', ascending=False).reset_index(drop=True)
             
-            logger.info(f"Retrieved {len(df)} trades from database")
+            logger.info("Retrieved %d trades from database", len(df))
             return df
         except Exception as e:
             logger.error(f"Error getting trades from database: {str(e)}")
             return pd.DataFrame()  # Return empty DataFrame on error
     
+    @_locked
+    def get_latest_trade_id(self):
+        """
+        Get the ID of the newest trade, as a cheap check for new trades.
+        
+        Returns:
+            int: The highest trade ID, or None if there are no trades
+        """
+        try:
+            # Ensure connection is active
+            if not self.conn:
+                self.connect()
+            
+            # MAX over the rowid is answered from the end of the table's B-tree
+            return self.conn.execute("SELECT MAX(id) FROM trades").fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error getting latest trade ID from database: {str(e)}")
+            return None
+    
+    @_locked
     def get_market_scans(self, pair=None, signal=None, start_date=None, end_date=None, limit=None):
         """
         Get market scans from the database with optional filtering.
@@ -366,58 +825,46 @@ class TradingDatabase:
             if not self.conn:
                 self.connect()
             
-            # Build query
-            query = "SELECT * FROM market_scans WHERE 1=1"
+            # Read back queued writes made by this instance
+            self.flush()
+            
+            # Build filters
+            filters = []
             params = []
             
             if pair:
-                query += " AND pair = ?"
+                filters.append('pair')
                 params.append(pair)
             
             if signal:
-                query += " AND signal = ?"
+                filters.append('signal')
                 params.append(signal)
             
             if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date} 00:00:00")
+                filters.append('start_date')
+                params.append(_to_epoch(f"{start_date} 00:00:00"))
             
             if end_date:
-                query += " AND timestamp <= ?"
-                params.append(f"{end_date} 23:59:59")
+                filters.append('end_date')
+                params.append(_to_epoch(f"{end_date} 23:59:59"))
             
-            query += " ORDER BY timestamp DESC"
-            
-            if limit:
-                query += " LIMIT ?"
-                params.append(limit)
+            params.append(limit or -1)
+            query = _build_select('market_scans', tuple(filters))
             
             # Execute query and return as DataFrame
-            df = pd.read_sql_query(query, self.conn, params=params)
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            df = self._query_df(query, params)
             
-            # Parse indicators json
+            # Parse indicators json in one pass over the raw values
             if not df.empty and 'indicators' in df.columns:
-                import json
-                
-                def parse_indicators(indicators_str):
-                    if pd.isna(indicators_str) or not indicators_str:
-                        return {}
-                    try:
-                        return json.loads(indicators_str)
-                    except:
-                        return {}
-                
-                df['indicators_dict'] = df['indicators'].apply(parse_indicators)
+                df['indicators_dict'] = [_parse_indicators(value) for value in df['indicators'].to_numpy()]
             
-            logger.info(f"Retrieved {len(df)} market scans from database")
+            logger.info("Retrieved %d market scans from database", len(df))
             return df
         except Exception as e:
             logger.error(f"Error getting market scans from database: {str(e)}")
             return pd.DataFrame()  # Return empty DataFrame on error
     
+    @_locked
     def get_bot_status(self, status=None, start_date=None, end_date=None, limit=None):
         """
         Get bot status entries from the database with optional filtering.
@@ -436,49 +883,71 @@ class TradingDatabase:
             if not self.conn:
                 self.connect()
             
-            # Build query
-            query = "SELECT * FROM bot_status WHERE 1=1"
+            # Read back queued writes made by this instance
+            self.flush()
+            
+            # Build filters
+            filters = []
             params = []
             
             if status:
-                query += " AND status = ?"
+                filters.append('status')
                 params.append(status)
             
             if start_date:
-                query += " AND timestamp >= ?"
-                params.append(f"{start_date} 00:00:00")
+                filters.append('start_date')
+                params.append(_to_epoch(f"{start_date} 00:00:00"))
             
             if end_date:
-                query += " AND timestamp <= ?"
-                params.append(f"{end_date} 23:59:59")
+                filters.append('end_date')
+                params.append(_to_epoch(f"{end_date} 23:59:59"))
             
-            query += " ORDER BY timestamp DESC"
-            
-            if limit:
-                query += " LIMIT ?"
-                params.append(limit)
+            params.append(limit or -1)
+            query = _build_select('bot_status', tuple(filters))
             
             # Execute query and return as DataFrame
-            df = pd.read_sql_query(query, self.conn, params=params)
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
-            
-            # Parse active_pairs
-            if not df.empty and 'active_pairs' in df.columns:
-                def parse_active_pairs(pairs_str):
-                    if pd.isna(pairs_str) or not pairs_str:
-                        return []
-                    return pairs_str.split(',')
-                
-                df['active_pairs_list'] = df['active_pairs'].apply(parse_active_pairs)
-            
-            logger.info(f"Retrieved {len(df)} bot status entries from database")
+            df = self._query_df(query, params)
+            
+            # Attach active pairs, falling back to the legacy comma-joined column
+            if not df.empty:
+                ids = df['id'].to_numpy()
+                pairs_by_id = self._get_status_pairs(ids.tolist())
+                df['active_pairs_list'] = [
+                    pairs_by_id.get(status_id) or (value.split(',') if isinstance(value, str) and value else [])
+                    for status_id, value in zip(ids.tolist(), df['active_pairs'].to_numpy())
+                ]
+                df['active_pairs'] = [','.join(pairs) or None for pairs in df['active_pairs_list']]
+            
+            logger.info("Retrieved %d bot status entries from database", len(df))
             return df
         except Exception as e:
             logger.error(f"Error getting bot status from database: {str(e)}")
             return pd.DataFrame()  # Return empty DataFrame on error
     
+    def _get_status_pairs(self, status_ids):
+        """
+        Read bot_status_pairs rows for the given status IDs.
+        
+        Args:
+            status_ids (list): Status IDs to look up
+            
+        Returns:
+            dict: Status ID -> list of pairs, in the order they were logged
+        """
+        pairs_by_id = {}
+        # Query in chunks to stay under SQLite's bound-parameter limit
+        for start in range(0, len(status_ids), _STATUS_PAIRS_CHUNK):
+            chunk = status_ids[start:start + _STATUS_PAIRS_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            cursor = self.conn.execute(
+                f"SELECT status_id, pair FROM bot_status_pairs WHERE status_id IN ({placeholders}) ORDER BY rowid",
+                chunk
+            )
+            for status_id, pair in cursor:
+                pairs_by_id.setdefault(status_id, []).append(pair)
+        return pairs_by_id
+    
+    @_locked
     def get_latest_scan(self, pair=None):
         """
         Get the most recent market scan for a pair.
@@ -494,9 +963,10 @@ class TradingDatabase:
             if not self.conn:
                 self.connect()
             
-            cursor = self.conn.cursor()
+            # Read back queued writes made by this instance
+            self.flush()
             
-            query = "SELECT * FROM market_scans"
+            query = f"SELECT {_SCAN_SELECT} FROM market_scans"
             params = []
             
             if pair:
@@ -505,31 +975,29 @@ class TradingDatabase:
             
             query += " ORDER BY timestamp DESC LIMIT 1"
             
-            cursor.execute(query, params)
+            cursor = self.conn.execute(query, params)
             result = cursor.fetchone()
             
             if result:
                 # Convert to dictionary
                 columns = [col[0] for col in cursor.description]
                 scan_dict = dict(zip(columns, result))
+                scan_dict['timestamp'] = _format_epoch(scan_dict['timestamp'])
                 
                 # Parse indicators
                 if scan_dict.get('indicators'):
-                    import json
-                    try:
-                        scan_dict['indicators'] = json.loads(scan_dict['indicators'])
-                    except:
-                        scan_dict['indicators'] = {}
+                    scan_dict['indicators'] = _parse_indicators(scan_dict['indicators'])
                 
-                logger.info(f"Retrieved latest scan for {'all pairs' if not pair else pair}")
+                logger.info("Retrieved latest scan for %s", pair or 'all pairs')
                 return scan_dict
             else:
-                logger.info(f"No scans found for {'all pairs' if not pair else pair}")
+                logger.info("No scans found for %s", pair or 'all pairs')
                 return None
         except Exception as e:
             logger.error(f"Error getting latest scan from database: {str(e)}")
             return None
     
+    @_locked
     def get_latest_status(self):
         """
         Get the most recent bot status.
@@ -542,17 +1010,24 @@ class TradingDatabase:
             if not self.conn:
                 self.connect()
             
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT * FROM bot_status ORDER BY timestamp DESC LIMIT 1")
+            # Read back queued writes made by this instance
+            self.flush()
+            
+            cursor = self.conn.execute("SELECT * FROM bot_status ORDER BY timestamp DESC LIMIT 1")
             result = cursor.fetchone()
             
             if result:
                 # Convert to dictionary
                 columns = [col[0] for col in cursor.description]
                 status_dict = dict(zip(columns, result))
+                status_dict['timestamp'] = _format_epoch(status_dict['timestamp'])
                 
-                # Parse active_pairs
-                if status_dict.get('active_pairs'):
+                # Attach active pairs, falling back to the legacy comma-joined column
+                pairs = self._get_status_pairs([status_dict['id']]).get(status_dict['id'])
+                if pairs:
+                    status_dict['active_pairs_list'] = pairs
+                    status_dict['active_pairs'] = ','.join(pairs)
+                elif status_dict.get('active_pairs'):
                     status_dict['active_pairs_list'] = status_dict['active_pairs'].split(',')
                 else:
                     status_dict['active_pairs_list'] = []
@@ -566,6 +1041,7 @@ class TradingDatabase:
             logger.error(f"Error getting latest status from database: {str(e)}")
             return None
     
+    @_locked
     def import_from_csv(self, csv_file):
         """
         Import trades from a CSV file into the database.
@@ -591,8 +1067,9 @@ class TradingDatabase:
                     logger.error(f"CSV file missing required column: {col}")
                     return 0
             
-            # Make sure timestamp is formatted correctly
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            # Store timestamps as epoch seconds
+            timestamps = pd.to_datetime(df['timestamp'])
+            df['timestamp'] = (timestamps - pd.Timestamp(0)) // pd.Timedelta(seconds=1)
             
             # Rename columns if needed to match database schema
             column_mapping = {
@@ -607,13 +1084,7 @@ class TradingDatabase:
                     df[new_col] = df[old_col]
             
             # Add created_at column
-            df['created_at'] = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Convert DataFrame to records
-            records = df.to_dict('records')
-            
-            # Insert into database
-            cursor = self.conn.cursor()
+            df['created_at'] = _utc_now()[1]
             
             # Determine which columns to use from the dataframe
             columns = ['timestamp', 'pair', 'action', 'price', 'quantity', 'created_at']
@@ -629,14 +1100,13 @@ class TradingDatabase:
             
             query = f"INSERT INTO trades ({columns_str}) VALUES ({placeholders})"
             
-            # Insert records
-            count = 0
-            for record in records:
-                values = [str(record[col]) if col == 'timestamp' else record.get(col) for col in columns]
-                cursor.execute(query, values)
-                count += 1
+            # Insert all records in a single transaction; executemany pulls
+            # plain tuples from the iterator, so no per-row dicts are built
+            rows = df[columns].itertuples(index=False, name=None)
+            with self.conn:
+                self.conn.executemany(query, rows)
+            count = len(df)
             
-            self.conn.commit()
             logger.info(f"Imported {count} trades from CSV file: {csv_file}")
             
             return count
@@ -646,6 +1116,7 @@ class TradingDatabase:
                 self.conn.rollback()
             return 0
     
+    @_locked
     def export_to_csv(self, csv_file, start_date=None, end_date=None):
         """
         Export trades from the database to a CSV file.
@@ -659,32 +1130,53 @@ class TradingDatabase:
             int: Number of trades exported
         """
         try:
-            # Get trades with filters
-            df = self.get_trades(start_date=start_date, end_date=end_date)
+            # Ensure connection is active
+            if not self.conn:
+                self.connect()
             
-            # Drop unwanted columns
-            columns_to_keep = ['timestamp', 'pair', 'action', 'price', 'quantity', 
-                               'net_profit', 'profit_pct', 'order_id', 'strategy']
-            columns_to_keep = [col for col in columns_to_keep if col in df.columns]
+            # Apply date filters in SQL
+            filters = []
+            params = []
             
-            df = df[columns_to_keep]
+            if start_date:
+                filters.append('start_date')
+                params.append(_to_epoch(f"{start_date} 00:00:00"))
+            
+            if end_date:
+                filters.append('end_date')
+                params.append(_to_epoch(f"{end_date} 23:59:59"))
+            
+            where = "".join(f" AND {_FILTER_SQL[name]}" for name in filters)
+            query = (f"SELECT {_EXPORT_SELECT} FROM trades WHERE 1=1{where} "
+                     "ORDER BY timestamp DESC, id DESC")
+            
+            # Stream rows from the cursor straight to the file
+            count = 0
+            with open(csv_file, 'w', newline='', buffering=1 << 20) as f:
+                writer = csv.writer(f)
+                writer.writerow(_EXPORT_COLUMNS)
+                for row in self.conn.execute(query, params):
+                    writer.writerow(row)
+                    count += 1
             
-            # Save to CSV
-            df.to_csv(csv_file, index=False)
-            logger.info(f"Exported {len(df)} trades to CSV file: {csv_file}")
+            logger.info(f"Exported {count} trades to CSV file: {csv_file}")
             
-            return len(df)
+            return count
         except Exception as e:
             logger.error(f"Error exporting to CSV: {str(e)}")
             return 0
-            
-    def __del__(self):
-        """Destructor to ensure the database connection is closed."""
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the database when leaving a 'with' block."""
         self.close()
 
 
 # Singleton instance for global access
 _db_instance = None
+_db_instance_lock = threading.Lock()
 
 def get_db(db_file=None):
     """
@@ -699,7 +1191,11 @@ def get_db(db_file=None):
     global _db_instance
     
     if _db_instance is None:
-        _db_instance = TradingDatabase(db_file)
+        with _db_instance_lock:
+            if _db_instance is None:
+                _db_instance = TradingDatabase(db_file)
+                # Flush queued writes and close cleanly at interpreter exit
+                atexit.register(_db_instance.close)
     
     return _db_instance
 
@@ -2,21 +2,30 @@ import sys
 sys.path.insert(0, '.')  # Ensure the current directory is in the path
 
 import os
-from dotenv import load_dotenv
+import json
+import time
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from config import (
     API_KEY, API_SECRET, STRATEGY, LOG_FILE, USE_TESTNET, 
     DEFAULT_INTERVAL, TRADING_PAIRS, MAX_RISK_PER_TRADE,
-    STOP_LOSS_PERCENTAGE, TAKE_PROFIT_PERCENTAGE
+    STOP_LOSS_PERCENTAGE, TAKE_PROFIT_PERCENTAGE, DATA_DIR, ensure_dirs
 )
+
+# Create log/data directories before any module opens files in them
+ensure_dirs()
+
 from src.strategies.bot_manager import BotManager
 from src.utils.bot_monitor import BotMonitor
 import logging
 from binance.client import Client
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from src.utils.logger import console_message, get_logger
 from src.utils.logger_utils import log_bot_status
 
-# Load environment variables from .env file
-load_dotenv()
+# Environment variables were loaded from .env once by config.get_config()
 
 # Ensure these variables are loaded
 if not API_KEY or not API_SECRET:
@@ -27,6 +36,41 @@ if not API_KEY or not API_SECRET:
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 logging.getLogger("discord_webhook").setLevel(logging.WARNING)
 
+# USDT balance from the last startup, reused on quick restarts (skip with --no-cache)
+STARTUP_CACHE_FILE = os.path.join(DATA_DIR, '.startup_cache.json')
+STARTUP_CACHE_TTL = 60  # seconds
+use_startup_cache = '--no-cache' not in sys.argv
+
+def load_cached_balance():
+    """Return the USDT balance cached less than STARTUP_CACHE_TTL seconds ago, or None"""
+    try:
+        with open(STARTUP_CACHE_FILE) as f:
+            cache = json.load(f)
+        if time.time() - cache['fetched_at'] < STARTUP_CACHE_TTL:
+            return float(cache['usdt_balance'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+def fetch_usdt_balance(client):
+    """Fetch the free USDT balance from Binance and cache it for the next startup"""
+    # Suppress the account info dump
+    account_info = client.get_account()
+    usdt_balance = next((float(balance['free']) for balance in account_info['balances'] if balance['asset'] == 'USDT'), 0)
+    try:
+        with open(STARTUP_CACHE_FILE, 'w') as f:
+            json.dump({'usdt_balance': usdt_balance, 'fetched_at': time.time()}, f)
+    except OSError:
+        pass
+    return usdt_balance
+
+def refresh_balance_cache(client):
+    """Background refresh of the startup cache; failures only mean a cold next start"""
+    try:
+        fetch_usdt_balance(client)
+    except Exception:
+        pass
+
 # Strategy validation
 valid_strategies = ['SMA', 'RSI', 'COMBINED', 'SMALL', 'TRON11']
 if STRATEGY not in valid_strategies:
@@ -37,29 +81,51 @@ if STRATEGY not in valid_strategies:
 try:
     console_message(f"🚀 Starting Advanced Trading Bot...")
     
-    # Try to connect to Binance with time synchronization
-    binance_client = Client(API_KEY, API_SECRET, tld='com')
-    
-    # Get server time for diagnostics
-    server_time = binance_client.get_server_time()
-    import time
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Resolve the api1 host in the background while the client connects
+        executor.submit(socket.getaddrinfo, 'api1.binance.com', 443)
+        
+        # Try to connect to Binance with time synchronization
+        binance_client = Client(API_KEY, API_SECRET, tld='com')
+        
+        # Keep TLS connections alive in a larger pool so later calls skip the handshake;
+        # retries only cover idempotent requests, so orders are never re-sent
+        binance_client.session.mount('https://', HTTPAdapter(
+            pool_connections=8, pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.1)
+        ))
+        binance_client.session.headers['Connection'] = 'keep-alive'
+        # api1 is an alternative Binance endpoint, often with lower latency
+        binance_client.API_URL = 'https://api1.binance.com/api'
+        
+        # Server time and account info are independent, so fetch them concurrently;
+        # account info is skipped when a recent startup cached the balance
+        server_time_future = executor.submit(binance_client.get_server_time)
+        cached_balance = load_cached_balance() if use_startup_cache else None
+        if cached_balance is None:
+            balance_future = executor.submit(fetch_usdt_balance, binance_client)
+        
+        # Get server time for diagnostics
+        server_time = server_time_future.result()
+        local_timestamp = int(time.time() * 1000)
     from datetime import datetime
     
     # Calculate time difference
     server_timestamp = server_time['serverTime']
-    local_timestamp = int(time.time() * 1000)
     time_diff = server_timestamp - local_timestamp
     
     # Show time sync information
     server_time_str = datetime.fromtimestamp(server_timestamp / 1000).strftime('%Y-%m-%d %H:%M:%S')
     console_message(f"📡 Connected to Binance API (Time offset: {time_diff} ms)")
     
-    # Suppress the account info dump
-    account_info = binance_client.get_account()
-    
     # Display account balances
-    usdt_balance = next((float(balance['free']) for balance in account_info['balances'] if balance['asset'] == 'USDT'), 0)
-    console_message(f"💵 USDT Balance: ${usdt_balance:.2f}")
+    if cached_balance is None:
+        usdt_balance = balance_future.result()
+        console_message(f"💵 USDT Balance: ${usdt_balance:.2f}")
+    else:
+        usdt_balance = cached_balance
+        console_message(f"💵 USDT Balance: ${usdt_balance:.2f} (cached)")
+        threading.Thread(target=refresh_balance_cache, args=(binance_client,), daemon=True).start()
     
 except Exception as e:
     console_message(f"❌ Error connecting to Binance: {str(e)}")
@@ -1,5 +1,7 @@
 import os
+import errno
 import shutil
+from pathlib import Path
 from datetime import datetime
 
 def create_directory_structure():
@@ -16,7 +18,7 @@ def create_directory_structure():
     ]
     
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
+        Path(directory).mkdir(parents=True, exist_ok=True)
         print(f"Created directory: {directory}")
 
 def move_files():
@@ -64,12 +66,19 @@ def organize_logs():
     
     for log_file in log_files:
         if os.path.exists(log_file):
-            # Create backup in data/backups
+            # Create backup in data/backups; a real copy, since the moved log
+            # (e.g. logs/bot.log) keeps being appended to by the bot
             backup_path = os.path.join('data', 'backups', f'{log_file}_{timestamp}')
             shutil.copy2(log_file, backup_path)
             
-            # Move to logs directory
-            shutil.move(log_file, os.path.join('logs', log_file))
+            # Move to logs directory; a rename unless logs/ is on another device
+            logs_path = os.path.join('logs', log_file)
+            try:
+                os.replace(log_file, logs_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(log_file, logs_path)
             print(f"Moved and backed up {log_file}")
 
 def cleanup():
@@ -4,12 +4,84 @@ Script to run the trading bot.
 
 import os
 import sys
+import time
+import logging
+import _thread
+import threading
+import config
+from database import get_db
+from scan_logger import get_scan_logger
+
+try:
+    import psutil  # optional; used where /proc is not available (e.g. macOS)
+except ImportError:
+    psutil = None
+
+# Make sure log/data folders exist before the logger is set up
+config.ensure_dirs()
+
 from src.trading_bot import TradingBot
 from src.utils.logger import get_logger
 
 logger = get_logger()
 
+# Set by the memory watchdog before it interrupts the main thread
+_restart_requested = threading.Event()
+
+def current_rss_mb():
+    """
+    Return this process's current resident memory in MB, or None if unknown.
+    
+    Current RSS rather than ru_maxrss: the peak survives os.execv, so after
+    one restart it would stay over the limit and trigger restarts forever.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+def watch_memory(limit_mb, interval):
+    """
+    Request a restart once current RSS passes limit_mb.
+    
+    The main thread is interrupted as if Ctrl+C was pressed, wherever it is,
+    so the bot can be stopped mid-cycle (e.g. between placing an order and
+    recording it). Only enabled when config.RESTART_RSS_MB is set.
+    """
+    while True:
+        time.sleep(interval)
+        rss_mb = current_rss_mb()
+        if rss_mb is not None and rss_mb >= limit_mb:
+            logger.warning(f"Memory {rss_mb:.0f} MB passed {limit_mb} MB, restarting bot")
+            _restart_requested.set()
+            _thread.interrupt_main()
+            return
+
+def restart():
+    """Replace this process with a fresh copy of the bot"""
+    # exec skips atexit, so flush pending database/scan log writes and logs first
+    get_db().close()
+    get_scan_logger().close()
+    logging.shutdown()
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
 def main():
+    # Heap fragmentation from pandas/rich grows RSS over multi-day runs;
+    # re-exec'ing the bot gives that memory back to the OS (POSIX only, where
+    # os.execv replaces the process in place)
+    if os.name == "posix" and current_rss_mb() is not None and config.RESTART_RSS_MB:
+        threading.Thread(
+            target=watch_memory,
+            args=(config.RESTART_RSS_MB, config.RSS_CHECK_INTERVAL),
+            name="memory-watchdog",
+            daemon=True
+        ).start()
+    
     try:
         # Initialize the trading bot
         bot = TradingBot()
@@ -18,10 +90,14 @@ def main():
         bot.run_continuous()
         
     except KeyboardInterrupt:
-        logger.info("Bot stopped by user")
+        if not _restart_requested.is_set():
+            logger.info("Bot stopped by user")
     except Exception as e:
         logger.error(f"Error running bot: {e}")
         raise
+    
+    if _restart_requested.is_set():
+        restart()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,39 +1,97 @@
 """
 Enhanced logging for cryptocurrency trading bot scans.
-Creates structured CSV logs for easier analysis.
+Creates structured CSV logs for easier analysis, or compact msgpack
+logs when config.SCAN_LOG_FORMAT is "msgpack".
 """
 
 import csv
 import os
-from datetime import datetime
+import atexit
+from datetime import datetime, timezone
 import logging
 import config
 
+try:
+    import msgpack  # optional, only needed for SCAN_LOG_FORMAT = "msgpack"
+except ImportError:
+    msgpack = None
+
+# Buffered rows are flushed to disk every this many scans
+FLUSH_EVERY = 32
+
+# Header row of a new CSV log, preformatted; csv.writer also ends rows with \r\n
+_CSV_HEADER = "timestamp,pair,interval,signal,price,volume,strategy,indicators\r\n"
+
+# Console icon per signal; anything else (hold, etc.) gets the neutral icon
+_SIGNAL_ICONS = {'buy': '🟢', 'long': '🟢', 'sell': '🔴', 'short': '🔴'}
+
+def _msgpack_default(value):
+    """Convert numpy scalars (and anything else unknown) for msgpack"""
+    return value.item() if hasattr(value, "item") else str(value)
+
 class ScanLogger:
     """
     A specialized logger for trading bot scans that creates structured, 
     easy-to-read logs in CSV format.
+    
+    With SCAN_LOG_FORMAT = "msgpack" each scan is instead appended to
+    scan_log_<date>.msgpack as one packed (timestamp, pair, interval, signal,
+    price, volume, strategy, indicators) tuple, with unrounded prices and the
+    indicators dict kept as-is.
     """
     
     def __init__(self):
         # Use config paths
         self.log_dir = config.SCAN_LOGS_DIR
+        config.ensure_dirs()
         
-        # Set up date-based logging
-        self.today = datetime.utcnow().strftime("%Y-%m-%d")
-        self.csv_file = os.path.join(self.log_dir, f"scan_log_{self.today}.csv")
+        # Resolve optional settings once instead of on every scan
+        self.detailed_logging = getattr(config, 'DETAILED_SCAN_LOGGING', True)
+        self.default_strategy = getattr(config, 'STRATEGY', 'UNKNOWN')
         
         # Get a logger instance
         self.logger = logging.getLogger("trading_bot")
         
+        self.binary = getattr(config, 'SCAN_LOG_FORMAT', 'csv') == 'msgpack'
+        if self.binary and msgpack is None:
+            self.logger.warning("SCAN_LOG_FORMAT is 'msgpack' but msgpack is not installed; using CSV")
+            self.binary = False
+        
+        # Set up date-based logging with one open, buffered file per day
+        self._fh = None
+        self._row_count = 0
+        self._open_day(datetime.now(timezone.utc))
+        atexit.register(self.close)
+    
+    def _open_day(self, now):
+        """Close the current log file (if any) and open the one for the UTC date of ``now``."""
+        self.close()
+        self._today_tuple = (now.year, now.month, now.day)
+        self.today = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+        
+        # Runs once a day; recreate the folder if it was removed since startup
+        os.makedirs(self.log_dir, exist_ok=True)
+        
+        # msgpack records are self-contained, so the file needs no header
+        if self.binary:
+            self.csv_file = os.path.join(self.log_dir, f"scan_log_{self.today}.msgpack")
+            self._fh = open(self.csv_file, mode="ab", buffering=64 * 1024)
+            return
+        
+        self.csv_file = os.path.join(self.log_dir, f"scan_log_{self.today}.csv")
+        
         # Initialize CSV file if it doesn't exist
-        if not os.path.exists(self.csv_file):
-            with open(self.csv_file, mode="w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "timestamp", "pair", "interval", "signal", 
-                    "price", "volume", "strategy", "indicators"
-                ])
+        is_new = not os.path.exists(self.csv_file)
+        self._fh = open(self.csv_file, mode="a", newline="", buffering=64 * 1024)
+        self._writer = csv.writer(self._fh)
+        if is_new:
+            self._fh.write(_CSV_HEADER)
+    
+    def close(self):
+        """Flush and close the current log file."""
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
     
     def log_scan(self, pair, interval, signal, price, volume, strategy=None, indicators=None):
         """
@@ -49,39 +107,44 @@ class ScanLogger:
             indicators (dict): Dictionary of indicator values
         """
         # Skip if detailed logging is disabled
-        if not getattr(config, 'DETAILED_SCAN_LOGGING', True):
+        if not self.detailed_logging:
             return
             
-        timestamp = datetime.utcnow()
-        timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        # f-string formatting of the fields is much cheaper than strftime
+        ts = datetime.now(timezone.utc)
+        timestamp_str = (f"{ts.year:04d}-{ts.month:02d}-{ts.day:02d} "
+                         f"{ts.hour:02d}:{ts.minute:02d}:{ts.second:02d}")
         
         # Format indicators as a string
         indicators_str = ""
         if indicators and isinstance(indicators, dict):
             # Convert indicators dictionary to a string format
-            indicators_str = "; ".join([f"{k}:{v}" for k, v in indicators.items()])
+            indicators_str = "; ".join(f"{k}:{v}" for k, v in indicators.items())
         
         # Use the strategy from config if not provided
         if not strategy:
-            strategy = getattr(config, 'STRATEGY', 'UNKNOWN')
+            strategy = self.default_strategy
             
         # Add emoji based on signal
-        signal_icon = "⚪"  # default/hold
-        if signal.lower() in ['buy', 'long']:
-            signal_icon = "🟢"
-        elif signal.lower() in ['sell', 'short']:
-            signal_icon = "🔴"
+        signal_icon = _SIGNAL_ICONS.get(signal.lower(), "⚪")
             
         # Log to standard logger (summary only)
         log_msg = (f"SCAN: {pair} ({interval}) - {strategy} - Signal: {signal} - "
                   f"Price: {price:.2f}")
         self.logger.info(f"{signal_icon} {log_msg}")
             
-        # Log to CSV file
+        # Log to file, switching files when the UTC date changes
         try:
-            with open(self.csv_file, mode="a", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow([
+            if (ts.year, ts.month, ts.day) != self._today_tuple or self._fh is None:
+                self._open_day(ts)
+            
+            if self.binary:
+                self._fh.write(msgpack.packb(
+                    (timestamp_str, pair, interval, signal, price, volume, strategy, indicators or {}),
+                    default=_msgpack_default
+                ))
+            else:
+                self._writer.writerow([
                     timestamp_str,
                     pair,
                     interval,
@@ -91,8 +154,11 @@ class ScanLogger:
                     strategy,
                     indicators_str
                 ])
+            self._row_count += 1
+            if self._row_count % FLUSH_EVERY == 0:
+                self._fh.flush()
         except Exception as e:
-            self.logger.error(f"Failed to write scan log to CSV: {str(e)}")
+            self.logger.error(f"Failed to write scan log to {self.csv_file}: {str(e)}")
 
 # Singleton instance
 _scan_logger = None
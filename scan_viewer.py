@@ -3,25 +3,66 @@ Utility to view and analyze trading bot scan logs.
 """
 
 import os
-import csv
 import sys
+import argparse
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+import pandas as pd
 import config
 
+try:
+    import msgpack  # only needed to read .msgpack scan logs
+except ImportError:
+    msgpack = None
+
+# Text columns of a scan log; read as str so values like "1h" stay untouched
+SCAN_TEXT_COLUMNS = ["timestamp", "pair", "interval", "signal", "strategy", "indicators"]
+
+# Field order of a scan record, as written to CSV and msgpack logs
+SCAN_FIELDS = ["timestamp", "pair", "interval", "signal", "price", "volume", "strategy", "indicators"]
+
+# Scan logs are CSV by default, or msgpack with SCAN_LOG_FORMAT = "msgpack"
+LOG_EXTENSIONS = (".csv", ".msgpack")
+
+# Per-pair summary slot for buy/sell signals; every other signal counts as hold (slot 3)
+_SIGNAL_SLOTS = {"buy": 1, "sell": 2}
+
+# Icon per lowercased signal in scan details; anything else shows as hold
+_SIGNAL_ICONS = {"buy": "🟢", "sell": "🔴"}
+
 def list_log_files():
     """List all available scan log files"""
     log_files = []
     
     try:
-        for filename in os.listdir(config.SCAN_LOGS_DIR):
-            if filename.startswith("scan_log_") and filename.endswith(".csv"):
-                date_str = filename.replace("scan_log_", "").replace(".csv", "")
-                log_files.append(date_str)
+        # Slice the date out of "scan_log_<date>.<ext>" rather than rebuilding the name
+        with os.scandir(config.SCAN_LOGS_DIR) as entries:
+            log_files = {os.path.splitext(entry.name)[0][9:] for entry in entries
+                         if entry.name.startswith("scan_log_") and entry.name.endswith(LOG_EXTENSIONS)}
     except FileNotFoundError:
         print(f"Log directory not found: {config.SCAN_LOGS_DIR}")
     
     return sorted(log_files)
 
+def parse_indicators(text):
+    """Parse a "key:value; key:value" indicators string into a dict"""
+    indicators = {}
+    if text:
+        for item in text.split(";"):
+            if ":" in item:
+                key, value = item.split(":", 1)
+                try:
+                    indicators[key.strip()] = float(value.strip())
+                except ValueError:
+                    indicators[key.strip()] = value.strip()
+    return indicators
+
+def scan_indicators(scan):
+    """Return a scan's indicators dict, parsing the raw CSV string on first use"""
+    if "indicators" not in scan:
+        scan["indicators"] = parse_indicators(scan.get("indicators_raw", ""))
+    return scan["indicators"]
+
 def load_scan_log(date_str=None):
     """
     Load scan log data for a specific date
@@ -30,44 +71,71 @@ def load_scan_log(date_str=None):
         date_str: Date string in YYYY-MM-DD format or None for today
     
     Returns:
-        List of dictionaries containing scan log entries
+        List of dictionaries containing scan log entries. Entries read from
+        CSV keep the indicators as the raw "indicators_raw" string; use
+        scan_indicators() to get them as a dict.
     """
     if date_str is None:
         date_str = datetime.utcnow().strftime("%Y-%m-%d")
     
-    log_file = os.path.join(config.SCAN_LOGS_DIR, f"scan_log_{date_str}.csv")
+    csv_file = os.path.join(config.SCAN_LOGS_DIR, f"scan_log_{date_str}.csv")
+    msgpack_file = os.path.join(config.SCAN_LOGS_DIR, f"scan_log_{date_str}.msgpack")
+    has_csv = os.path.exists(csv_file)
+    has_msgpack = os.path.exists(msgpack_file)
     
-    if not os.path.exists(log_file):
+    if not has_csv and not has_msgpack:
         print(f"No log file found for date: {date_str}")
         return []
     
+    data = []
+    if has_csv:
+        data += read_csv_log(csv_file)
+    if has_msgpack:
+        data += read_msgpack_log(msgpack_file)
+    
+    # The format was switched during the day; merge both files in time order
+    if has_csv and has_msgpack:
+        data.sort(key=lambda scan: scan["timestamp"])
+    
+    return data
+
+def read_csv_log(log_file):
+    """Read a CSV scan log into a list of scan dictionaries"""
     data = []
     try:
-        with open(log_file, mode="r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Parse indicators
-                indicators = {}
-                if "indicators" in row and row["indicators"]:
-                    for item in row["indicators"].split(";"):
-                        if ":" in item:
-                            key, value = item.split(":", 1)
-                            try:
-                                indicators[key.strip()] = float(value.strip())
-                            except ValueError:
-                                indicators[key.strip()] = value.strip()
-                
-                # Add parsed row to data
-                entry = {
-                    "timestamp": row["timestamp"],
-                    "pair": row["pair"],
-                    "interval": row["interval"],
-                    "signal": row["signal"],
-                    "price": float(row["price"]) if row["price"] else 0.0,
-                    "volume": float(row["volume"]) if row["volume"] else 0.0,
-                    "strategy": row.get("strategy", ""),
-                    "indicators": indicators
-                }
+        # Parse the whole file with pandas' C reader; empty prices/volumes become 0.0
+        df = pd.read_csv(
+            log_file,
+            dtype={col: str for col in SCAN_TEXT_COLUMNS},
+            keep_default_na=False,
+            na_values={"price": [""], "volume": [""]},
+        )
+        for col in SCAN_TEXT_COLUMNS:
+            if col not in df.columns:
+                df[col] = ""
+        df["price"] = df["price"].astype(float).fillna(0.0)
+        df["volume"] = df["volume"].astype(float).fillna(0.0)
+        # Indicators are parsed lazily by scan_indicators(), only for scans printed
+        df = df[SCAN_FIELDS].rename(columns={"indicators": "indicators_raw"})
+        data = df.to_dict("records")
+    except Exception as e:
+        print(f"Error reading log file: {str(e)}")
+    
+    return data
+
+def read_msgpack_log(log_file):
+    """Read a msgpack scan log (one packed tuple per scan) into a list of scan dictionaries"""
+    if msgpack is None:
+        print(f"Cannot read {log_file}: the msgpack package is not installed")
+        return []
+    
+    data = []
+    try:
+        with open(log_file, mode="rb") as f:
+            for record in msgpack.Unpacker(f, raw=False):
+                entry = dict(zip(SCAN_FIELDS, record))
+                entry["strategy"] = entry["strategy"] or ""
+                entry["indicators"] = entry["indicators"] or {}
                 data.append(entry)
     except Exception as e:
         print(f"Error reading log file: {str(e)}")
@@ -84,35 +152,34 @@ def summarize_scans(scans):
             "strategies": {}
         }
     
-    # Initialize counters
-    signals = {}
-    pairs = {}
-    strategies = {}
+    # Initialize counters; per-pair counts are [total, buy, sell, hold]
+    signals = Counter()
+    pairs = defaultdict(lambda: [0, 0, 0, 0])
+    strategies = Counter()
     
     # Count signals, pairs, and strategies
     for scan in scans:
         signal = scan["signal"].lower()
-        pair = scan["pair"]
-        strategy = scan["strategy"]
         
         # Count signals
-        signals[signal] = signals.get(signal, 0) + 1
+        signals[signal] += 1
         
         # Count pairs
-        if pair not in pairs:
-            pairs[pair] = {"total": 0, "buy": 0, "sell": 0, "hold": 0}
-        pairs[pair]["total"] += 1
-        signal_type = signal if signal in ["buy", "sell"] else "hold"
-        pairs[pair][signal_type] += 1
+        counts = pairs[scan["pair"]]
+        counts[0] += 1
+        counts[_SIGNAL_SLOTS.get(signal, 3)] += 1
         
         # Count strategies
-        strategies[strategy] = strategies.get(strategy, 0) + 1
+        strategies[scan["strategy"]] += 1
     
     return {
         "total_scans": len(scans),
-        "signals": signals,
-        "pairs": pairs,
-        "strategies": strategies
+        "signals": dict(signals),
+        "pairs": {
+            pair: {"total": total, "buy": buy, "sell": sell, "hold": hold}
+            for pair, (total, buy, sell, hold) in pairs.items()
+        },
+        "strategies": dict(strategies)
     }
 
 def print_summary(summary):
@@ -141,18 +208,20 @@ def print_summary(summary):
 
 def filter_scans(scans, pair=None, signal=None, strategy=None):
     """Filter scans based on criteria"""
-    filtered = scans.copy()
+    # Build checks only for the criteria given, then test each scan once
+    checks = []
     
     if pair:
-        filtered = [scan for scan in filtered if scan["pair"] == pair]
+        checks.append(lambda scan: scan["pair"] == pair)
     
     if signal:
-        filtered = [scan for scan in filtered if scan["signal"].lower() == signal.lower()]
+        signal_lower = signal.lower()
+        checks.append(lambda scan: scan["signal"].lower() == signal_lower)
     
     if strategy:
-        filtered = [scan for scan in filtered if scan["strategy"] == strategy]
+        checks.append(lambda scan: scan["strategy"] == strategy)
     
-    return filtered
+    return [scan for scan in scans if all(check(scan) for check in checks)]
 
 def print_scans(scans, limit=20):
     """Print scan details in a readable format"""
@@ -165,18 +234,15 @@ def print_scans(scans, limit=20):
     
     print("\n===== SCAN DETAILS =====")
     for scan in display_scans:
-        signal_icon = "⚪"  # default/hold
-        if scan["signal"].lower() == "buy":
-            signal_icon = "🟢"
-        elif scan["signal"].lower() == "sell":
-            signal_icon = "🔴"
+        signal_icon = _SIGNAL_ICONS.get(scan["signal"].lower(), "⚪")
         
         print(f"{signal_icon} [{scan['timestamp']}] {scan['pair']} ({scan['interval']})")
         print(f"  Signal: {scan['signal']}, Price: {scan['price']:.2f}, Strategy: {scan['strategy']}")
         
-        if scan["indicators"]:
+        indicators = scan_indicators(scan)
+        if indicators:
             print("  Indicators:")
-            for key, value in scan["indicators"].items():
+            for key, value in indicators.items():
                 if isinstance(value, float):
                     print(f"    {key}: {value:.2f}")
                 else:
@@ -210,52 +276,54 @@ def print_help():
     print("  python scan_viewer.py --strategy COMBINED --summary")
     print("")
 
+def build_parser():
+    """Build the command line parser; usage text comes from print_help"""
+    # No prefix matching and no argparse exit, so bad input goes through main()'s
+    # "Unknown option" path like the old hand-written parser
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False, exit_on_error=False)
+    parser.add_argument("--date", dest="date_str")
+    parser.add_argument("--pair")
+    parser.add_argument("--signal")
+    parser.add_argument("--strategy")
+    parser.add_argument("--limit", default="20")
+    parser.add_argument("--summary", dest="summary_only", action="store_true")
+    parser.add_argument("--list", dest="list_dates", action="store_true")
+    parser.add_argument("--help", action="store_true")
+    return parser
+
+# Parser is built once at import
+PARSER = build_parser()
+
 def main():
     """Main function to run the scan viewer"""
-    args = sys.argv[1:]
-    
     # Parse command line arguments
-    date_str = None
-    pair = None
-    signal = None
-    strategy = None
-    summary_only = False
-    list_dates = False
-    limit = 20
+    try:
+        options, unknown = PARSER.parse_known_args(sys.argv[1:])
+    except argparse.ArgumentError as e:
+        print(f"Unknown option: {e.argument_name}")
+        print_help()
+        return
     
-    i = 0
-    while i < len(args):
-        if args[i] == "--date" and i+1 < len(args):
-            date_str = args[i+1]
-            i += 2
-        elif args[i] == "--pair" and i+1 < len(args):
-            pair = args[i+1]
-            i += 2
-        elif args[i] == "--signal" and i+1 < len(args):
-            signal = args[i+1]
-            i += 2
-        elif args[i] == "--strategy" and i+1 < len(args):
-            strategy = args[i+1]
-            i += 2
-        elif args[i] == "--limit" and i+1 < len(args):
-            try:
-                limit = int(args[i+1])
-            except ValueError:
-                print(f"Invalid limit value: {args[i+1]}")
-            i += 2
-        elif args[i] == "--summary":
-            summary_only = True
-            i += 1
-        elif args[i] == "--list":
-            list_dates = True
-            i += 1
-        elif args[i] == "--help":
-            print_help()
-            return
-        else:
-            print(f"Unknown option: {args[i]}")
-            print_help()
-            return
+    if options.help:
+        print_help()
+        return
+    
+    if unknown:
+        print(f"Unknown option: {unknown[0]}")
+        print_help()
+        return
+    
+    date_str = options.date_str
+    pair = options.pair
+    signal = options.signal
+    strategy = options.strategy
+    summary_only = options.summary_only
+    list_dates = options.list_dates
+    limit = 20
+    try:
+        limit = int(options.limit)
+    except ValueError:
+        print(f"Invalid limit value: {options.limit}")
     
     # List available dates
     if list_dates:
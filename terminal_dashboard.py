@@ -23,6 +23,11 @@ import pandas as pd
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 from src.utils.database import get_trades, get_latest_status
 
+try:
+    from src.utils.database import get_latest_trade_id
+except ImportError:
+    get_latest_trade_id = None  # older database module; probe with get_trades
+
 # Initialize Rich console
 console = Console()
 
@@ -34,6 +39,9 @@ HYPERION_YELLOW = Style(color="yellow")
 HYPERION_PURPLE = Style(color="magenta")
 HYPERION_WHITE = Style(color="white")
 
+# Columns shown in the recent trades table, in display order
+RECENT_TRADE_COLUMNS = ['timestamp', 'pair', 'action', 'net_profit']
+
 class HyperionDashboard:
     def __init__(self):
         self.console = Console()
@@ -55,25 +63,73 @@ class HyperionDashboard:
             Layout(name="status"),
             Layout(name="performance")
         )
+        
+        # Trades are re-read only when a new trade shows up
+        self._trades_df = None
+        self._latest_trade_id = None
+        self._trade_stats = None
+        self._recent_trades = []
+        self._last_status = None
+        self._last_hash = None
+        
+        # Header and footer are built once; only the header clock text changes.
+        # The title and clock keep fixed lengths, so their style spans stay valid.
+        self._header_text = Text("HYPERION TRADING SYSTEM", style=HYPERION_BLUE)
+        self._header_text.append(f"\nTime: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", style=HYPERION_WHITE)
+        self._header_panel = Panel(self._header_text, style=HYPERION_BLUE, box=box.DOUBLE)
+        self.layout["header"].update(self._header_panel)
+        self.layout["footer"].update(self.generate_footer())
+
+    def _refresh_trades(self):
+        """
+        Reload trades and their summary figures if a newer trade exists.
+
+        Returns True if the trades were reloaded.
+        """
+        # MAX(id) probe; get_trades(limit=1) still computes running profit
+        # over the whole trades table, so it is only the fallback
+        if get_latest_trade_id is not None:
+            latest_id = get_latest_trade_id()
+        else:
+            latest = get_trades(limit=1)
+            latest_id = latest['id'].iloc[0] if 'id' in latest.columns and not latest.empty else None
+        if self._trades_df is not None and latest_id is not None and latest_id == self._latest_trade_id:
+            return False
+
+        trades_df = get_trades()
+        has_pnl = 'net_profit' in trades_df.columns
+        has_cumulative = 'cumulative_net_profit' in trades_df.columns and not trades_df.empty
+
+        # Summary figures shared by the metrics and performance panels
+        self._trade_stats = {
+            'total_trades': len(trades_df),
+            'total_pnl': trades_df['net_profit'].sum() if has_pnl else 0,
+            'win_rate': (trades_df['net_profit'] > 0).mean() * 100 if has_pnl else 0,
+            'cumulative_pnl': trades_df['cumulative_net_profit'].iloc[-1] if has_cumulative else None,
+        }
+        # Last 5 trades as plain tuples; columns missing from the frame show as ''
+        # (or 0 PnL), like the old per-row .get() defaults
+        recent = trades_df.tail(5).reindex(columns=RECENT_TRADE_COLUMNS, fill_value='')
+        if not has_pnl:
+            recent['net_profit'] = 0
+        self._recent_trades = list(recent.itertuples(index=False, name=None))
+        self._trades_df = trades_df
+        self._latest_trade_id = latest_id
+        return True
 
     def generate_header(self):
         """Generate the sci-fi themed header"""
-        title = Text("HYPERION TRADING SYSTEM", style=HYPERION_BLUE)
-        timestamp = Text(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", style=HYPERION_WHITE)
-        return Panel(
-            title + "\n" + timestamp,
-            style=HYPERION_BLUE,
-            box=box.DOUBLE
-        )
+        self._header_text.plain = f"HYPERION TRADING SYSTEM\nTime: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        return self._header_panel
 
-    def generate_metrics(self, trades_df):
+    def generate_metrics(self, stats):
         """Generate trading metrics panel"""
-        if trades_df.empty:
+        if not stats['total_trades']:
             return Panel("No trading data available", style=HYPERION_YELLOW)
 
-        total_trades = len(trades_df)
-        total_pnl = trades_df['net_profit'].sum() if 'net_profit' in trades_df.columns else 0
-        win_rate = (trades_df['net_profit'] > 0).mean() * 100 if 'net_profit' in trades_df.columns else 0
+        total_trades = stats['total_trades']
+        total_pnl = stats['total_pnl']
+        win_rate = stats['win_rate']
 
         metrics_text = Text()
         metrics_text.append(f"Total Trades: {total_trades}\n", style=HYPERION_WHITE)
@@ -83,9 +139,9 @@ class HyperionDashboard:
 
         return Panel(metrics_text, title="Trading Metrics", style=HYPERION_BLUE, box=box.DOUBLE)
 
-    def generate_trades_table(self, trades_df):
+    def generate_trades_table(self, recent_trades):
         """Generate recent trades table"""
-        if trades_df.empty:
+        if not recent_trades:
             return Panel("No trades available", style=HYPERION_YELLOW)
 
         table = Table(show_header=True, header_style=HYPERION_BLUE, box=box.DOUBLE)
@@ -94,15 +150,13 @@ class HyperionDashboard:
         table.add_column("Action", style=HYPERION_WHITE)
         table.add_column("PnL", style=HYPERION_WHITE)
 
-        # Get last 5 trades
-        recent_trades = trades_df.tail(5)
-        for _, trade in recent_trades.iterrows():
-            pnl = trade.get('net_profit', 0)
+        # Last 5 trades, prepared when trades were refreshed
+        for timestamp, pair, action, pnl in recent_trades:
             pnl_style = HYPERION_GREEN if pnl >= 0 else HYPERION_RED
             table.add_row(
-                str(trade.get('timestamp', '')),
-                str(trade.get('pair', '')),
-                str(trade.get('action', '')),
+                str(timestamp),
+                str(pair),
+                str(action),
                 Text(f"${pnl:.2f}", style=pnl_style)
             )
 
@@ -118,14 +172,14 @@ class HyperionDashboard:
         
         return Panel(status_text, title="System Status", style=HYPERION_BLUE, box=box.DOUBLE)
 
-    def generate_performance(self, trades_df):
+    def generate_performance(self, stats):
         """Generate performance visualization"""
-        if trades_df.empty:
+        if not stats['total_trades']:
             return Panel("No performance data available", style=HYPERION_YELLOW)
 
         # Simple ASCII chart for cumulative PnL
-        if 'cumulative_net_profit' in trades_df.columns:
-            pnl = trades_df['cumulative_net_profit'].iloc[-1]
+        if stats['cumulative_pnl'] is not None:
+            pnl = stats['cumulative_pnl']
             chart = "█" * min(abs(int(pnl/100)), 50)  # Simple bar chart
             chart_text = Text()
             chart_text.append(f"Cumulative PnL: ${pnl:.2f}\n", 
@@ -144,32 +198,50 @@ class HyperionDashboard:
         return Panel(footer_text, style=HYPERION_BLUE, box=box.DOUBLE)
 
     def update(self):
-        """Update the dashboard with latest data"""
+        """
+        Update the dashboard with latest data.
+
+        Returns the layout to draw, or None if nothing shown has changed.
+        """
         try:
             # Get latest data
-            trades_df = get_trades()
+            trades_changed = self._refresh_trades()
             status = get_latest_status()
 
-            # Update layout
-            self.layout["header"].update(self.generate_header())
-            self.layout["metrics"].update(self.generate_metrics(trades_df))
-            self.layout["trades"].update(self.generate_trades_table(trades_df))
-            self.layout["status"].update(self.generate_status(status))
-            self.layout["performance"].update(self.generate_performance(trades_df))
-            self.layout["footer"].update(self.generate_footer())
+            # Skip the redraw entirely while trades and status are unchanged
+            data_hash = hash((self._latest_trade_id, len(self._trades_df),
+                              status.get('status'), status.get('account_value')))
+            if data_hash == self._last_hash:
+                return None
+            self._last_hash = data_hash
+
+            # Update layout; panels are only rebuilt when their data changed
+            self.generate_header()
+            if trades_changed:
+                self.layout["metrics"].update(self.generate_metrics(self._trade_stats))
+                self.layout["trades"].update(self.generate_trades_table(self._recent_trades))
+                self.layout["performance"].update(self.generate_performance(self._trade_stats))
+            if status != self._last_status:
+                self.layout["status"].update(self.generate_status(status))
+                self._last_status = status
 
             return self.layout
         except Exception as e:
+            # Redraw the full layout once the error clears
+            self._last_hash = None
             return Panel(f"Error updating dashboard: {str(e)}", style=HYPERION_RED)
 
 def main():
     """Main function to run the terminal dashboard"""
     dashboard = HyperionDashboard()
     
-    with Live(dashboard.layout, refresh_per_second=1) as live:
+    # Rendered only when update() reports a change, not on a timer
+    with Live(dashboard.layout, auto_refresh=False) as live:
         try:
             while True:
-                live.update(dashboard.update())
+                layout = dashboard.update()
+                if layout is not None:
+                    live.update(layout, refresh=True)
                 time.sleep(1)
         except KeyboardInterrupt:
             console.print("\n[bold red]Shutting down HYPERION Trading System...[/bold red]")